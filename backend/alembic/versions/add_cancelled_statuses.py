@@ -0,0 +1,41 @@
+"""add CANCELLED to workflow, product and task statuses
+
+Revision ID: add_cancelled_statuses
+Revises: add_cascade_delete_fks
+Create Date: 2026-10-15
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_cancelled_statuses'
+down_revision = 'add_cascade_delete_fks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add a CANCELLED value to the workflowstatus, productstatus and taskstatus
+    enum types.
+
+    Closing a project stops its in-flight workflows, products and tasks; they
+    are marked CANCELLED so a user's close is not reported as a failure.
+    """
+    # ALTER TYPE ... ADD VALUE cannot be used inside the migration transaction
+    # on older PostgreSQL versions, so run it in autocommit mode.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE workflowstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+        op.execute("ALTER TYPE productstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+        op.execute("ALTER TYPE taskstatus ADD VALUE IF NOT EXISTS 'CANCELLED'")
+
+
+def downgrade():
+    """
+    PostgreSQL cannot drop a value from an enum type, so CANCELLED is left in
+    place. Rows using it are moved to FAILED so older code can still read them.
+    """
+    op.execute("UPDATE workflow SET status = 'FAILED' WHERE status = 'CANCELLED'")
+    op.execute("UPDATE workflowstep SET status = 'FAILED' WHERE status = 'CANCELLED'")
+    op.execute("UPDATE product SET status = 'FAILED' WHERE status = 'CANCELLED'")
+    op.execute("UPDATE task SET status = 'FAILED' WHERE status = 'CANCELLED'")
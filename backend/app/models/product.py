@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import ForeignKey
 from sqlmodel import Field, SQLModel
 
 
@@ -10,10 +11,13 @@ class ProductStatus(str, Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class ProductBase(SQLModel):
-    project_id: int = Field(foreign_key="project.id", index=True)
+    project_id: int = Field(
+        sa_column_args=[ForeignKey("project.id", ondelete="CASCADE")], index=True
+    )
     name: str = Field(index=True)
     stack: Optional[str] = None
     objective: Optional[str] = None
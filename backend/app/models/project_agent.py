@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import ForeignKey
 from sqlmodel import Field, SQLModel
 
 
@@ -16,7 +17,9 @@ class ProjectAgentRole(str, Enum):
 class ProjectAgentBase(SQLModel):
     """Base model for project-agent association."""
 
-    project_id: int = Field(foreign_key="project.id", index=True)
+    project_id: int = Field(
+        sa_column_args=[ForeignKey("project.id", ondelete="CASCADE")], index=True
+    )
     agent_id: int = Field(foreign_key="agent.id", index=True)
     role: ProjectAgentRole = Field(default=ProjectAgentRole.PRIMARY)
     scope: Optional[str] = Field(default=None)  # JSON string defining scope
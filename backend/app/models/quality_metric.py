@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import ForeignKey
 from sqlmodel import Field, SQLModel
 
 
@@ -28,7 +29,9 @@ class MetricStatus(str, Enum):
 class QualityMetricBase(SQLModel):
     """Base model for quality metrics."""
 
-    project_id: int = Field(foreign_key="project.id", index=True)
+    project_id: int = Field(
+        sa_column_args=[ForeignKey("project.id", ondelete="CASCADE")], index=True
+    )
     category: MetricCategory
     name: str = Field(index=True)
     description: Optional[str] = None
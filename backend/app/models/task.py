@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import ForeignKey
 from sqlmodel import Field, SQLModel
 
 
@@ -11,6 +12,7 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     BLOCKED = "blocked"
+    CANCELLED = "cancelled"
 
 
 class TaskType(str, Enum):
@@ -24,12 +26,22 @@ class TaskType(str, Enum):
     INFRA = "infra"
 
 
+# Fallback titles for tasks created without one, e.g. "Untitled Ux Review".
+# Keyed by value; TaskType members compare and hash equal to their values.
+_DEFAULT_TITLES: dict[str, str] = {
+    task_type.value: f"Untitled {task_type.value.replace('_', ' ').title()}"
+    for task_type in TaskType
+}
+
+
 class TaskBase(SQLModel):
     title: str = Field(index=True)
     description: Optional[str] = None
     task_type: TaskType
     status: TaskStatus = Field(default=TaskStatus.PENDING)
-    project_id: int = Field(foreign_key="project.id")
+    project_id: int = Field(
+        sa_column_args=[ForeignKey("project.id", ondelete="CASCADE")]
+    )
     assigned_agent: Optional[str] = None
     error_message: Optional[str] = None
 
@@ -49,14 +61,13 @@ class Task(TaskBase, table=True):
         # Validate and fix title if needed
         if title is None or (isinstance(title, str) and not title.strip()):
             # Generate fallback title based on task_type
-            if isinstance(task_type, TaskType):
-                task_type_str = task_type.value.replace("_", " ").title()
-            elif isinstance(task_type, str):
-                task_type_str = task_type.replace("_", " ").title()
+            if isinstance(task_type, str):
+                # TaskType members and their plain string values hit the table
+                data["title"] = _DEFAULT_TITLES.get(task_type) or (
+                    f"Untitled {task_type.replace('_', ' ').title()}"
+                )
             else:
-                task_type_str = "Task"
-            
-            data["title"] = f"Untitled {task_type_str}"
+                data["title"] = "Untitled Task"
         elif isinstance(title, str):
             # Strip whitespace from valid titles
             data["title"] = title.strip()
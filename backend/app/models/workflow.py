@@ -2,6 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import ForeignKey
 from sqlmodel import Field, SQLModel
 
 
@@ -11,6 +12,7 @@ class WorkflowStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     ROLLED_BACK = "rolled_back"
+    CANCELLED = "cancelled"
 
 
 class WorkflowStepType(str, Enum):
@@ -43,7 +45,9 @@ class WorkflowStepType(str, Enum):
 
 class WorkflowBase(SQLModel):
     name: str = Field(index=True)
-    project_id: int = Field(foreign_key="project.id")
+    project_id: int = Field(
+        sa_column_args=[ForeignKey("project.id", ondelete="CASCADE")]
+    )
     status: WorkflowStatus = Field(default=WorkflowStatus.PENDING)
     current_step: Optional[str] = None
 
@@ -22,6 +22,7 @@ import json
 import logging
 import shutil
 import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -38,6 +39,12 @@ logger = logging.getLogger(__name__)
 
 WORKSPACE_BASE = Path("/tmp/blugreen_workspaces")
 GIT_TIMEOUT = 30  # seconds - consistent timeout for all Git operations
+BRANCH_CACHE_TTL = 300  # seconds - how long a detected default branch is reused
+
+# Detected default branches keyed by repository URL: url -> (detected_at, branch).
+# Every detection spawns up to six `git ls-remote` processes, each paying a fresh
+# TLS/SSH handshake, so repeated assumptions of the same repository reuse the result.
+_branch_cache: dict[str, tuple[float, str]] = {}
 
 
 class ValidationError(Exception):
@@ -801,6 +808,10 @@ class ProjectAssumptionService:
         3. List all remote branches and use the first one
         4. Raise CouldNotDetectBranchError with details
 
+        Successful detections are cached per repository URL for BRANCH_CACHE_TTL
+        seconds and expired entries are evicted on the next write; failures are
+        never cached.
+
         Args:
             repository_url: The URL of the Git repository
 
@@ -810,6 +821,24 @@ class ProjectAssumptionService:
         Raises:
             CouldNotDetectBranchError: If the default branch cannot be detected
         """
+        cached = _branch_cache.get(repository_url)
+        if cached and time.monotonic() - cached[0] < BRANCH_CACHE_TTL:
+            logger.info(f"[ASSUME] Using cached default branch: {cached[1]}")
+            return cached[1]
+
+        branch = self._run_branch_detection(repository_url)
+
+        # Evict expired entries on write so the cache only holds live detections
+        now = time.monotonic()
+        expired = [url for url, (detected_at, _) in _branch_cache.items()
+                   if now - detected_at >= BRANCH_CACHE_TTL]
+        for url in expired:
+            del _branch_cache[url]
+        _branch_cache[repository_url] = (now, branch)
+        return branch
+
+    def _run_branch_detection(self, repository_url: str) -> str:
+        """Run the git-based detection algorithm without consulting the cache."""
         logger.info(f"[ASSUME] Starting branch detection for: {repository_url}")
 
         # Step 1: Try git ls-remote --symref HEAD
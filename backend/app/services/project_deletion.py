@@ -5,8 +5,10 @@ This module implements the governed DELETE behavior, ensuring that
 projects cannot be deleted while they have active processes.
 """
 
-from typing import Tuple, Optional, List
-from sqlmodel import Session, select, func
+from typing import Any, Tuple, Optional, List, cast
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.sql.dml import Update
+from sqlmodel import Session, col, select, func, update
 from app.models.project import Project, ProjectStatus
 from app.models.workflow import Workflow, WorkflowStatus
 from app.models.product import Product, ProductStatus
@@ -21,6 +23,12 @@ class DeletionBlockReason:
     PROJECT_RUNNING = "project_running"
 
 
+# Statuses that count as an in-flight process and block deletion
+ACTIVE_WORKFLOW_STATUSES = [WorkflowStatus.PENDING, WorkflowStatus.IN_PROGRESS]
+ACTIVE_PRODUCT_STATUSES = [ProductStatus.RUNNING]
+ACTIVE_TASK_STATUSES = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]
+
+
 def check_active_dependencies(project_id: int, session: Session) -> Tuple[bool, dict]:
     """
     Check if a project has active dependencies that block deletion.
@@ -33,10 +41,10 @@ def check_active_dependencies(project_id: int, session: Session) -> Tuple[bool,
         Tuple of (can_delete: bool, block_response: dict)
         
     Business Rules:
-        - Projects with RUNNING status cannot be deleted
-        - Projects with active workflows cannot be deleted
-        - Projects with active products cannot be deleted
-        - Projects with pending/running tasks cannot be deleted
+        - Projects with ACTIVE status cannot be deleted
+        - Projects with pending/in-progress workflows cannot be deleted
+        - Projects with running products cannot be deleted
+        - Projects with pending/in-progress tasks cannot be deleted
     """
     
     # Check if project exists
@@ -44,27 +52,26 @@ def check_active_dependencies(project_id: int, session: Session) -> Tuple[bool,
     if not project:
         return True, {}  # Non-existent projects can be "deleted" (404 will be returned)
     
-    # Count active dependencies
-    active_workflows = session.exec(
-        select(func.count(Workflow.id))
-        .where(Workflow.project_id == project_id)
-        .where(Workflow.status.in_([WorkflowStatus.RUNNING, WorkflowStatus.PENDING]))
-    ).one()
-    
-    active_products = session.exec(
-        select(func.count(Product.id))
-        .where(Product.project_id == project_id)
-        .where(Product.status.in_([ProductStatus.RUNNING, ProductStatus.PENDING]))
-    ).one()
-    
-    active_tasks = session.exec(
-        select(func.count(Task.id))
-        .where(Task.project_id == project_id)
-        .where(Task.status.in_([TaskStatus.RUNNING, TaskStatus.PENDING]))
+    # Count active dependencies in a single round trip
+    active_workflows, active_products, active_tasks = session.exec(
+        select(
+            select(func.count(col(Workflow.id)))
+            .where(col(Workflow.project_id) == project_id)
+            .where(col(Workflow.status).in_(ACTIVE_WORKFLOW_STATUSES))
+            .scalar_subquery(),
+            select(func.count(col(Product.id)))
+            .where(col(Product.project_id) == project_id)
+            .where(col(Product.status).in_(ACTIVE_PRODUCT_STATUSES))
+            .scalar_subquery(),
+            select(func.count(col(Task.id)))
+            .where(col(Task.project_id) == project_id)
+            .where(col(Task.status).in_(ACTIVE_TASK_STATUSES))
+            .scalar_subquery(),
+        )
     ).one()
     
     # Check if project is running
-    is_project_running = project.status == ProjectStatus.RUNNING
+    is_project_running = project.status == ProjectStatus.ACTIVE
     
     # If any active dependency exists, block deletion
     if active_workflows > 0 or active_products > 0 or active_tasks > 0 or is_project_running:
@@ -92,7 +99,7 @@ def get_deletion_block_response(
         active_workflows: Number of active workflows
         active_products: Number of active products
         active_tasks: Number of active tasks
-        is_project_running: Whether project status is RUNNING
+        is_project_running: Whether project status is ACTIVE
         
     Returns:
         Structured dictionary with error_code, message, details, and action
@@ -122,6 +129,12 @@ def get_deletion_block_response(
     }
 
 
+def _execute_update(session: Session, statement: Update) -> int:
+    """Run a bulk UPDATE and return the number of rows it changed."""
+    result = cast(CursorResult[Any], session.execute(statement))
+    return result.rowcount
+
+
 async def close_project(project_id: int, session: Session) -> dict:
     """
     Close a project by stopping all active processes.
@@ -134,10 +147,10 @@ async def close_project(project_id: int, session: Session) -> dict:
         Dictionary with operation result
         
     Actions:
-        - Stop all running workflows
-        - Stop all running products
-        - Cancel all pending/running tasks
-        - Mark project as INACTIVE
+        - Cancel all pending/in-progress workflows
+        - Cancel all running products
+        - Cancel all pending/in-progress tasks
+        - Move project back to DRAFT
     """
     
     project = session.get(Project, project_id)
@@ -145,47 +158,41 @@ async def close_project(project_id: int, session: Session) -> dict:
         return {"success": False, "error": "Project not found"}
     
     # Stop active workflows
-    active_workflows = session.exec(
-        select(Workflow)
-        .where(Workflow.project_id == project_id)
-        .where(Workflow.status.in_([WorkflowStatus.RUNNING, WorkflowStatus.PENDING]))
-    ).all()
-    
-    for workflow in active_workflows:
-        workflow.status = WorkflowStatus.CANCELLED
-        session.add(workflow)
+    stopped_workflows = _execute_update(
+        session,
+        update(Workflow)
+        .where(col(Workflow.project_id) == project_id)
+        .where(col(Workflow.status).in_(ACTIVE_WORKFLOW_STATUSES))
+        .values(status=WorkflowStatus.CANCELLED)
+    )
     
     # Stop active products
-    active_products = session.exec(
-        select(Product)
-        .where(Product.project_id == project_id)
-        .where(Product.status.in_([ProductStatus.RUNNING, ProductStatus.PENDING]))
-    ).all()
-    
-    for product in active_products:
-        product.status = ProductStatus.CANCELLED
-        session.add(product)
+    stopped_products = _execute_update(
+        session,
+        update(Product)
+        .where(col(Product.project_id) == project_id)
+        .where(col(Product.status).in_(ACTIVE_PRODUCT_STATUSES))
+        .values(status=ProductStatus.CANCELLED)
+    )
     
     # Cancel active tasks
-    active_tasks = session.exec(
-        select(Task)
-        .where(Task.project_id == project_id)
-        .where(Task.status.in_([TaskStatus.RUNNING, TaskStatus.PENDING]))
-    ).all()
-    
-    for task in active_tasks:
-        task.status = TaskStatus.CANCELLED
-        session.add(task)
+    cancelled_tasks = _execute_update(
+        session,
+        update(Task)
+        .where(col(Task.project_id) == project_id)
+        .where(col(Task.status).in_(ACTIVE_TASK_STATUSES))
+        .values(status=TaskStatus.CANCELLED)
+    )
     
     # Mark project as inactive
-    project.status = ProjectStatus.DRAFT  # or INACTIVE if that status exists
+    project.status = ProjectStatus.DRAFT
     session.add(project)
     
     session.commit()
     
     return {
         "success": True,
-        "workflows_stopped": len(active_workflows),
-        "products_stopped": len(active_products),
-        "tasks_cancelled": len(active_tasks)
+        "workflows_stopped": stopped_workflows,
+        "products_stopped": stopped_products,
+        "tasks_cancelled": cancelled_tasks
     }
@@ -1,7 +1,10 @@
+from typing import Optional
 from unittest.mock import patch
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
@@ -10,26 +13,79 @@ from app.main import app
 
 # Import all models to ensure they are registered with SQLModel.metadata
 from app.models import Agent, Project, Task, Workflow  # noqa: F401
+from app.models.product import Product, ProductStatus
+from app.models.task import TaskStatus, TaskType
+from app.models.workflow import WorkflowStatus
+from app.services import project_assumption
 
 
-@pytest.fixture(name="session")
-def session_fixture():
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture():
+    """In-memory SQLite engine whose schema is created once per test session."""
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite manages transactions itself and breaks SAVEPOINT handling;
+    # let SQLAlchemy emit BEGIN so the per-test savepoints below work.
+    # The PRAGMAs drop commit-time syncing and keep the whole schema cached.
+    # An in-memory database already journals in memory, so WAL does not apply.
+    # Foreign keys are enforced so ON DELETE CASCADE behaves as in production.
+    @event.listens_for(engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA journal_mode=MEMORY")
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+        dbapi_connection.execute("PRAGMA temp_store=MEMORY")
+        dbapi_connection.execute("PRAGMA cache_size=-64000")
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    """Session bound to an outer transaction that is rolled back after each test.
+
+    Commits and rollbacks issued by the code under test only release or roll
+    back SAVEPOINTs, so every test starts from the same empty schema.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
         yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
+@pytest.fixture(autouse=True)
+def clear_branch_cache():
+    """Start every test without cached default-branch detections."""
+    project_assumption._branch_cache.clear()
+    yield
+    project_assumption._branch_cache.clear()
+
+
+@pytest.fixture(name="app_client", scope="session")
+def app_client_fixture():
+    """One TestClient for the whole run; the session override is set per test."""
+    return TestClient(app)
 
-    app.dependency_overrides[get_session] = get_session_override
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, app_client: TestClient):
+    app.dependency_overrides[get_session] = lambda: session
 
     # Patch background task functions to prevent them from running during tests.
     # These tasks use get_session_context() which creates a new session from the
@@ -45,7 +101,87 @@ def client_fixture(session: Session):
         patch("app.api.assumption._run_diagnostics_task", noop_coroutine),
         patch("app.api.assumption._run_evolution_task", noop_coroutine),
     ):
-        client = TestClient(app)
-        yield client
+        try:
+            yield app_client
+        finally:
+            app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(name="async_client")
+async def async_client_fixture(session: Session):
+    """httpx.AsyncClient wired to the app in-process, sharing the test session."""
+    app.dependency_overrides[get_session] = lambda: session
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+
+
+# Factories for seeding test data. They flush rather than commit: the row gets
+# its id and is visible to requests sharing the test session, without ending
+# the transaction.
+@pytest.fixture(name="make_project")
+def make_project_fixture(session: Session, make_workflow, make_product, make_task):
+    def _make_project(
+        *,
+        workflow_status: Optional[WorkflowStatus] = None,
+        product_status: Optional[ProductStatus] = None,
+        task_status: Optional[TaskStatus] = None,
+        **overrides,
+    ) -> Project:
+        """Create a project plus one workflow/product/task for each status given."""
+        fields = {"name": "Test Project", "repository_url": "https://github.com/test/repo"}
+        project = Project(**{**fields, **overrides})
+        session.add(project)
+        session.flush()
+
+        if workflow_status is not None:
+            make_workflow(project, status=workflow_status)
+        if product_status is not None:
+            make_product(project, status=product_status)
+        if task_status is not None:
+            make_task(project, status=task_status)
+        return project
+
+    return _make_project
+
+
+@pytest.fixture(name="make_workflow")
+def make_workflow_fixture(session: Session):
+    def _make_workflow(project: Project, **overrides) -> Workflow:
+        workflow = Workflow(**{"name": "Test Workflow", "project_id": project.id, **overrides})
+        session.add(workflow)
+        session.flush()
+        return workflow
+
+    return _make_workflow
+
+
+@pytest.fixture(name="make_product")
+def make_product_fixture(session: Session):
+    def _make_product(project: Project, **overrides) -> Product:
+        product = Product(**{"name": "Test Product", "project_id": project.id, **overrides})
+        session.add(product)
+        session.flush()
+        return product
+
+    return _make_product
+
+
+@pytest.fixture(name="make_task")
+def make_task_fixture(session: Session):
+    def _make_task(project: Project, **overrides) -> Task:
+        fields = {
+            "title": "Test Task",
+            "task_type": TaskType.BACKEND,
+            "project_id": project.id,
+        }
+        task = Task(**{**fields, **overrides})
+        session.add(task)
+        session.flush()
+        return task
 
-    app.dependency_overrides.clear()
+    return _make_task
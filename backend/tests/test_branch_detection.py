@@ -1,39 +1,47 @@
 """Tests for branch detection in Project Assumption Service."""
 
 import subprocess
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlmodel import Session, create_engine
-from sqlmodel.pool import StaticPool
+from sqlmodel import Session
 
 from app.exceptions import CouldNotDetectBranchError
 from app.models.project import Project
+from app.services import project_assumption
 from app.services.project_assumption import ProjectAssumptionService
 
 
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    from sqlmodel import SQLModel
-
-    SQLModel.metadata.create_all(engine)
-
-    with Session(engine) as session:
-        yield session
-
-
 @pytest.fixture(name="service")
 def service_fixture(session: Session):
     """Create a ProjectAssumptionService instance."""
     return ProjectAssumptionService(session)
 
 
+@pytest.fixture(name="test_project")
+def test_project_fixture(session: Session):
+    """Create a persisted project to assume."""
+    project = Project(name="Test Project", description="Test")
+    session.add(project)
+    session.commit()
+    return project
+
+
+@pytest.fixture(name="mocked_steps")
+def mocked_steps_fixture(service: ProjectAssumptionService):
+    """Service whose workflow steps are replaced with successful AsyncMocks."""
+    service._step_fetch_repository = AsyncMock(
+        return_value={"step": "fetch_repository", "success": True, "result": {}}
+    )
+    service._step_index_codebase = AsyncMock(
+        return_value={"step": "index_codebase", "success": True, "result": {}}
+    )
+    service._step_detect_stack = AsyncMock(
+        return_value={"step": "detect_stack", "success": True, "result": {}}
+    )
+    return service
+
+
 class TestBranchDetection:
     """Test suite for _detect_default_branch method."""
 
@@ -68,6 +76,53 @@ class TestBranchDetection:
             assert branch == "master"
             mock_run.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_detect_branch_uses_cache(self, service: ProjectAssumptionService):
+        """Test that a second detection for the same URL does not call git again."""
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "ref: refs/heads/main\tHEAD\n1234567890abcdef\tHEAD\n"
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            first = await service._detect_default_branch("https://github.com/example/repo")
+            second = await service._detect_default_branch("https://github.com/example/repo")
+
+            assert first == second == "main"
+            mock_run.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_detect_branch_cache_expires(self, service: ProjectAssumptionService):
+        """Test that cached detections older than the TTL are refreshed."""
+        project_assumption._branch_cache["https://github.com/example/repo"] = (
+            -project_assumption.BRANCH_CACHE_TTL - 1,
+            "stale",
+        )
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "ref: refs/heads/main\tHEAD\n"
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            branch = await service._detect_default_branch("https://github.com/example/repo")
+
+            assert branch == "main"
+            mock_run.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_detect_branch_evicts_expired_entries(self, service: ProjectAssumptionService):
+        """Test that expired detections of other repositories are dropped on write."""
+        project_assumption._branch_cache["https://github.com/example/old"] = (
+            -project_assumption.BRANCH_CACHE_TTL - 1,
+            "stale",
+        )
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = "ref: refs/heads/main\tHEAD\n"
+
+        with patch("subprocess.run", return_value=mock_result):
+            await service._detect_default_branch("https://github.com/example/repo")
+
+        assert list(project_assumption._branch_cache) == ["https://github.com/example/repo"]
+
     @pytest.mark.asyncio
     async def test_detect_branch_via_common_names(self, service: ProjectAssumptionService):
         """Test detecting branch via common names when ls-remote fails."""
@@ -207,74 +262,50 @@ class TestAssumeProjectWithBranchDetection:
     """Test suite for assume_project with automatic branch detection."""
 
     @pytest.mark.asyncio
-    async def test_assume_project_with_explicit_branch(self, service: ProjectAssumptionService, session: Session):
+    async def test_assume_project_with_explicit_branch(
+        self, mocked_steps: ProjectAssumptionService, test_project: Project
+    ):
         """Test assume_project with explicitly provided branch."""
-        project = Project(name="Test Project", description="Test")
-        session.add(project)
-        session.commit()
-
-        # Mock the entire flow
-        with patch.object(service, "_step_fetch_repository") as mock_fetch, \
-             patch.object(service, "_step_index_codebase") as mock_index, \
-             patch.object(service, "_step_detect_stack") as mock_detect:
-
-            mock_fetch.return_value = {"step": "fetch_repository", "success": True, "result": {}}
-            mock_index.return_value = {"step": "index_codebase", "success": True, "result": {}}
-            mock_detect.return_value = {"step": "detect_stack", "success": True, "result": {}}
-
-            result = await service.assume_project(
-                project,
-                "https://github.com/example/repo",
-                branch="custom-branch",
-            )
+        result = await mocked_steps.assume_project(
+            test_project,
+            "https://github.com/example/repo",
+            branch="custom-branch",
+        )
 
-            assert result["status"] == "success"
-            assert result["branch"] == "custom-branch"
-            # Verify that _detect_default_branch was NOT called
-            mock_fetch.assert_called_once()
-            args = mock_fetch.call_args[0]
-            assert args[3] == "custom-branch"  # branch parameter
+        assert result["status"] == "success"
+        assert result["branch"] == "custom-branch"
+        mocked_steps._step_fetch_repository.assert_awaited_once()
+        # branch parameter; _detect_default_branch was not needed
+        assert mocked_steps._step_fetch_repository.await_args.args[3] == "custom-branch"
 
     @pytest.mark.asyncio
-    async def test_assume_project_with_auto_detection(self, service: ProjectAssumptionService, session: Session):
+    async def test_assume_project_with_auto_detection(
+        self, mocked_steps: ProjectAssumptionService, test_project: Project
+    ):
         """Test assume_project with automatic branch detection."""
-        project = Project(name="Test Project", description="Test")
-        session.add(project)
-        session.commit()
-
         # Mock branch detection
         mock_result = MagicMock()
         mock_result.returncode = 0
         mock_result.stdout = "ref: refs/heads/main\tHEAD\n"
 
-        with patch("subprocess.run", return_value=mock_result), \
-             patch.object(service, "_step_fetch_repository") as mock_fetch, \
-             patch.object(service, "_step_index_codebase") as mock_index, \
-             patch.object(service, "_step_detect_stack") as mock_detect:
-
-            mock_fetch.return_value = {"step": "fetch_repository", "success": True, "result": {}}
-            mock_index.return_value = {"step": "index_codebase", "success": True, "result": {}}
-            mock_detect.return_value = {"step": "detect_stack", "success": True, "result": {}}
-
-            result = await service.assume_project(
-                project,
+        with patch("subprocess.run", return_value=mock_result):
+            result = await mocked_steps.assume_project(
+                test_project,
                 "https://github.com/example/repo",
                 branch=None,  # No branch provided
             )
 
-            assert result["status"] == "success"
-            assert result["branch"] == "main"
-            mock_fetch.assert_called_once()
-            args = mock_fetch.call_args[0]
-            assert args[3] == "main"  # detected branch
+        assert result["status"] == "success"
+        assert result["branch"] == "main"
+        mocked_steps._step_fetch_repository.assert_awaited_once()
+        # detected branch
+        assert mocked_steps._step_fetch_repository.await_args.args[3] == "main"
 
     @pytest.mark.asyncio
-    async def test_assume_project_detection_failure(self, service: ProjectAssumptionService, session: Session):
+    async def test_assume_project_detection_failure(
+        self, service: ProjectAssumptionService, test_project: Project
+    ):
         """Test assume_project when branch detection fails."""
-        project = Project(name="Test Project", description="Test")
-        session.add(project)
-        session.commit()
-
         # Mock failed detection
         with patch.object(
             service,
@@ -287,7 +318,7 @@ class TestAssumeProjectWithBranchDetection:
             ),
         ):
             result = await service.assume_project(
-                project,
+                test_project,
                 "https://github.com/example/repo",
                 branch=None,
             )
@@ -8,58 +8,23 @@ Ensures that:
 4. Projects with deep dependencies are removed correctly
 """
 
-import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlmodel.pool import StaticPool
+from sqlmodel import Session
 
-from app.main import app
-from app.database import get_session
-from app.models.project import Project
 from app.models.product import Product
 from app.models.workflow import Workflow
-from app.models.task import Task, TaskType, TaskStatus
+from app.models.task import Task, TaskStatus
 from app.models.project_agent import ProjectAgent, ProjectAgentRole
 from app.models.quality_metric import QualityMetric, MetricCategory
 
 
-# Test database setup
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create in-memory SQLite database for testing."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    """Create test client with overridden database session."""
-    def get_session_override():
-        return session
-
-    app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
-
-
 # ============================================================
 # Test 1: DELETE never returns 500
 # ============================================================
 
-def test_delete_project_without_dependencies_returns_200(client: TestClient, session: Session):
+def test_delete_project_without_dependencies_returns_200(client: TestClient, make_project):
     """DELETE project without dependencies returns 200."""
-    # Create project
-    project = Project(name="Test Project", repository_url="https://github.com/test/repo")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project()
 
     # Delete project
     response = client.delete(f"/projects/{project.id}")
@@ -68,30 +33,16 @@ def test_delete_project_without_dependencies_returns_200(client: TestClient, ses
     assert response.json() == {"message": "Project deleted"}
 
 
-def test_delete_project_with_deep_dependencies_returns_200(client: TestClient, session: Session):
+def test_delete_project_with_deep_dependencies_returns_200(
+    client: TestClient, session: Session, make_project, make_workflow, make_task, make_product
+):
     """DELETE project with workflows, tasks, products returns 200 (CASCADE)."""
-    # Create project
-    project = Project(name="Complex Project", repository_url="https://github.com/test/complex")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="Complex Project")
 
     # Create dependencies
-    workflow = Workflow(name="Test Workflow", project_id=project.id)
-    session.add(workflow)
-    
-    task = Task(
-        name="Test Task",
-        task_type=TaskType.CODE_GENERATION,
-        status=TaskStatus.PENDING,
-        project_id=project.id
-    )
-    session.add(task)
-    
-    product = Product(name="Test Product", project_id=project.id)
-    session.add(product)
-    
-    session.commit()
+    workflow = make_workflow(project)
+    task = make_task(project, status=TaskStatus.PENDING)
+    product = make_product(project)
 
     # Delete project - should CASCADE delete all dependencies
     response = client.delete(f"/projects/{project.id}")
@@ -117,13 +68,9 @@ def test_delete_nonexistent_project_returns_404(client: TestClient):
 # Test 2: CORS headers always present
 # ============================================================
 
-def test_delete_with_cors_origin_returns_cors_headers(client: TestClient, session: Session):
+def test_delete_with_cors_origin_returns_cors_headers(client: TestClient, make_project):
     """DELETE with Origin header returns CORS headers."""
-    # Create project
-    project = Project(name="CORS Test", repository_url="https://github.com/test/cors")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="CORS Test")
 
     # Delete with Origin header
     response = client.delete(
@@ -169,13 +116,9 @@ def test_options_preflight_returns_cors_headers(client: TestClient):
 # Test 3: DELETE is idempotent
 # ============================================================
 
-def test_delete_is_idempotent(client: TestClient, session: Session):
+def test_delete_is_idempotent(client: TestClient, make_project):
     """DELETE same project twice returns 404 on second attempt."""
-    # Create project
-    project = Project(name="Idempotent Test", repository_url="https://github.com/test/idempotent")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="Idempotent Test")
 
     # First delete
     response1 = client.delete(f"/projects/{project.id}")
@@ -190,21 +133,15 @@ def test_delete_is_idempotent(client: TestClient, session: Session):
 # Test 4: No IntegrityError (regression test)
 # ============================================================
 
-def test_delete_never_returns_500_integrity_error(client: TestClient, session: Session):
+def test_delete_never_returns_500_integrity_error(
+    client: TestClient, make_project, make_workflow, make_task, make_product
+):
     """DELETE with all possible dependencies never returns 500."""
     # Create project with ALL types of dependencies
-    project = Project(name="Full Dependencies", repository_url="https://github.com/test/full")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    # Add all types of dependencies
-    workflow = Workflow(name="Workflow", project_id=project.id)
-    task = Task(name="Task", task_type=TaskType.CODE_GENERATION, status=TaskStatus.PENDING, project_id=project.id)
-    product = Product(name="Product", project_id=project.id)
-    
-    session.add_all([workflow, task, product])
-    session.commit()
+    project = make_project(name="Full Dependencies")
+    make_workflow(project)
+    make_task(project, status=TaskStatus.PENDING)
+    make_product(project)
 
     # Delete should work without IntegrityError
     response = client.delete(f"/projects/{project.id}")
@@ -218,21 +155,16 @@ def test_delete_never_returns_500_integrity_error(client: TestClient, session: S
 # Test 5: Validate CASCADE behavior
 # ============================================================
 
-def test_cascade_delete_removes_all_related_records(client: TestClient, session: Session):
+def test_cascade_delete_removes_all_related_records(
+    client: TestClient, session: Session, make_project, make_workflow, make_task, make_product
+):
     """CASCADE delete removes all related records automatically."""
-    # Create project
-    project = Project(name="CASCADE Test", repository_url="https://github.com/test/cascade")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="CASCADE Test")
 
     # Create multiple dependencies
-    workflows = [Workflow(name=f"Workflow {i}", project_id=project.id) for i in range(3)]
-    tasks = [Task(name=f"Task {i}", task_type=TaskType.CODE_GENERATION, status=TaskStatus.PENDING, project_id=project.id) for i in range(3)]
-    products = [Product(name=f"Product {i}", project_id=project.id) for i in range(3)]
-    
-    session.add_all(workflows + tasks + products)
-    session.commit()
+    workflows = [make_workflow(project, name=f"Workflow {i}") for i in range(3)]
+    tasks = [make_task(project, title=f"Task {i}", status=TaskStatus.PENDING) for i in range(3)]
+    products = [make_product(project, name=f"Product {i}") for i in range(3)]
 
     # Get IDs before delete
     workflow_ids = [w.id for w in workflows]
@@ -11,65 +11,28 @@ Ensures that:
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
-from sqlmodel.pool import StaticPool
-
-from app.main import app
-from app.database import get_session
-from app.models.project import Project, ProjectStatus
-from app.models.product import Product, ProductStatus
-from app.models.workflow import Workflow, WorkflowStatus
-from app.models.task import Task, TaskType, TaskStatus
-
-
-# Test database setup
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create in-memory SQLite database for testing."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    """Create test client with overridden database session."""
-    def get_session_override():
-        return session
 
-    app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+from app.models.project import ProjectStatus
+from app.models.product import ProductStatus
+from app.models.workflow import WorkflowStatus
+from app.models.task import TaskStatus
 
 
 # ============================================================
 # Test 1: DELETE with dependencies returns 409 with structured response
 # ============================================================
 
-def test_delete_with_active_workflow_returns_409_structured(client: TestClient, session: Session):
+def test_delete_with_active_workflow_returns_409_structured(client: TestClient, make_project, make_workflow):
     """DELETE with active workflow returns 409 with structured response."""
-    # Create project with active workflow
-    project = Project(name="Active", repository_url="https://github.com/test/active")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    workflow = Workflow(name="W", project_id=project.id, status=WorkflowStatus.RUNNING)
-    session.add(workflow)
-    session.commit()
+    project = make_project(name="Active")
+    make_workflow(project, status=WorkflowStatus.RUNNING)
 
     # Try to delete
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 409
     data = response.json()
-    
+
     # Validate structured response
     assert data["error_code"] == "PROJECT_HAS_ACTIVE_DEPENDENCIES"
     assert "message" in data
@@ -80,73 +43,46 @@ def test_delete_with_active_workflow_returns_409_structured(client: TestClient,
     assert "workflow" in str(data["details"]).lower()
 
 
-def test_delete_with_active_product_returns_409_structured(client: TestClient, session: Session):
+def test_delete_with_active_product_returns_409_structured(client: TestClient, make_project, make_product):
     """DELETE with active product returns 409 with structured response."""
-    # Create project with active product
-    project = Project(name="Active", repository_url="https://github.com/test/active")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    product = Product(name="P", project_id=project.id, status=ProductStatus.RUNNING)
-    session.add(product)
-    session.commit()
+    project = make_project(name="Active")
+    make_product(project, status=ProductStatus.RUNNING)
 
     # Try to delete
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 409
     data = response.json()
-    
+
     assert data["error_code"] == "PROJECT_HAS_ACTIVE_DEPENDENCIES"
     assert "produto" in str(data["details"]).lower()
 
 
-def test_delete_with_active_task_returns_409_structured(client: TestClient, session: Session):
+def test_delete_with_active_task_returns_409_structured(client: TestClient, make_project, make_task):
     """DELETE with active task returns 409 with structured response."""
-    # Create project with active task
-    project = Project(name="Active", repository_url="https://github.com/test/active")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    task = Task(
-        name="T",
-        task_type=TaskType.CODE_GENERATION,
-        status=TaskStatus.RUNNING,
-        project_id=project.id
-    )
-    session.add(task)
-    session.commit()
+    project = make_project(name="Active")
+    make_task(project, status=TaskStatus.RUNNING)
 
     # Try to delete
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 409
     data = response.json()
-    
+
     assert data["error_code"] == "PROJECT_HAS_ACTIVE_DEPENDENCIES"
     assert "tarefa" in str(data["details"]).lower()
 
 
-def test_delete_running_project_returns_409_structured(client: TestClient, session: Session):
+def test_delete_running_project_returns_409_structured(client: TestClient, make_project):
     """DELETE running project returns 409 with structured response."""
-    # Create running project
-    project = Project(
-        name="Running",
-        repository_url="https://github.com/test/running",
-        status=ProjectStatus.RUNNING
-    )
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="Running", status=ProjectStatus.RUNNING)
 
     # Try to delete
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 409
     data = response.json()
-    
+
     assert data["error_code"] == "PROJECT_HAS_ACTIVE_DEPENDENCIES"
     assert "execução" in str(data["details"]).lower()
 
@@ -155,44 +91,29 @@ def test_delete_running_project_returns_409_structured(client: TestClient, sessi
 # Test 2: DELETE without dependencies returns 200
 # ============================================================
 
-def test_delete_inactive_project_returns_200_structured(client: TestClient, session: Session):
+def test_delete_inactive_project_returns_200_structured(client: TestClient, make_project):
     """DELETE inactive project returns 200 with structured response."""
-    # Create inactive project
-    project = Project(
-        name="Inactive",
-        repository_url="https://github.com/test/inactive",
-        status=ProjectStatus.DRAFT
-    )
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+    project = make_project(name="Inactive", status=ProjectStatus.DRAFT)
 
     # Delete should work
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 200
     data = response.json()
-    
+
     # Validate structured response
     assert data["status"] == "deleted"
     assert data["project_id"] == project.id
 
 
-def test_delete_project_with_completed_workflows_returns_200(client: TestClient, session: Session):
+def test_delete_project_with_completed_workflows_returns_200(client: TestClient, make_project, make_workflow):
     """DELETE project with completed workflows returns 200."""
-    # Create project with completed workflow
-    project = Project(name="Completed", repository_url="https://github.com/test/completed")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    workflow = Workflow(name="W", project_id=project.id, status=WorkflowStatus.COMPLETED)
-    session.add(workflow)
-    session.commit()
+    project = make_project(name="Completed")
+    make_workflow(project, status=WorkflowStatus.COMPLETED)
 
     # Delete should work
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 200
     assert response.json()["status"] == "deleted"
 
@@ -201,14 +122,9 @@ def test_delete_project_with_completed_workflows_returns_200(client: TestClient,
 # Test 3: DELETE repeated returns 404 (idempotent)
 # ============================================================
 
-def test_delete_repeated_returns_404(client: TestClient, session: Session):
+def test_delete_repeated_returns_404(client: TestClient, make_project):
     """DELETE same project twice returns 404 on second attempt."""
-    # Create project
-    project = Project(name="Test", repository_url="https://github.com/test/test")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-    project_id = project.id
+    project_id = make_project().id
 
     # First delete
     response1 = client.delete(f"/projects/{project_id}")
@@ -217,15 +133,15 @@ def test_delete_repeated_returns_404(client: TestClient, session: Session):
     # Second delete (should return 404)
     response2 = client.delete(f"/projects/{project_id}")
     assert response2.status_code == 404
-    
+
     data = response2.json()
     assert data["error_code"] == "PROJECT_NOT_FOUND"
 
 
-def test_delete_nonexistent_project_returns_404(client: TestClient, session: Session):
+def test_delete_nonexistent_project_returns_404(client: TestClient):
     """DELETE non-existent project returns 404."""
     response = client.delete("/projects/99999")
-    
+
     assert response.status_code == 404
     data = response.json()
     assert data["error_code"] == "PROJECT_NOT_FOUND"
@@ -235,31 +151,22 @@ def test_delete_nonexistent_project_returns_404(client: TestClient, session: Ses
 # Test 4: DELETE never returns 500 for business rules
 # ============================================================
 
-def test_delete_with_multiple_dependencies_returns_409_not_500(client: TestClient, session: Session):
+def test_delete_with_multiple_dependencies_returns_409_not_500(
+    client: TestClient, make_project, make_workflow, make_product, make_task
+):
     """DELETE with multiple dependencies returns 409, not 500."""
     # Create project with all types of dependencies
-    project = Project(
-        name="Complex",
-        repository_url="https://github.com/test/complex",
-        status=ProjectStatus.RUNNING
-    )
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    workflow = Workflow(name="W", project_id=project.id, status=WorkflowStatus.RUNNING)
-    product = Product(name="P", project_id=project.id, status=ProductStatus.RUNNING)
-    task = Task(name="T", task_type=TaskType.CODE_GENERATION, status=TaskStatus.RUNNING, project_id=project.id)
-    
-    session.add_all([workflow, product, task])
-    session.commit()
+    project = make_project(name="Complex", status=ProjectStatus.RUNNING)
+    make_workflow(project, status=WorkflowStatus.RUNNING)
+    make_product(project, status=ProductStatus.RUNNING)
+    make_task(project, status=TaskStatus.RUNNING)
 
     # Try to delete - should return 409, not 500
     response = client.delete(f"/projects/{project.id}")
-    
+
     assert response.status_code == 409
     assert response.status_code != 500
-    
+
     data = response.json()
     assert data["error_code"] == "PROJECT_HAS_ACTIVE_DEPENDENCIES"
     assert len(data["details"]) >= 3  # Should list all 3+ dependencies
@@ -269,54 +176,41 @@ def test_delete_with_multiple_dependencies_returns_409_not_500(client: TestClien
 # Test 5: Headers CORS always present
 # ============================================================
 
-def test_delete_409_with_origin_returns_cors_headers(client: TestClient, session: Session):
-    """DELETE 409 with Origin header returns CORS headers."""
-    # Create project with active workflow
-    project = Project(name="Active", repository_url="https://github.com/test/active")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+def _missing_project(make_project, make_workflow) -> int:
+    return 99999
 
-    workflow = Workflow(name="W", project_id=project.id, status=WorkflowStatus.RUNNING)
-    session.add(workflow)
-    session.commit()
 
-    # Try to delete with Origin header
-    response = client.delete(
-        f"/projects/{project.id}",
-        headers={"Origin": "https://app.blugreen.com.br"}
-    )
-    
-    assert response.status_code == 409
-    assert "access-control-allow-origin" in response.headers
+def _project_with_running_workflow(make_project, make_workflow) -> int:
+    project = make_project(name="Active")
+    make_workflow(project, status=WorkflowStatus.RUNNING)
+    return project.id
 
 
-def test_delete_404_with_origin_returns_cors_headers(client: TestClient, session: Session):
-    """DELETE 404 with Origin header returns CORS headers."""
-    response = client.delete(
-        "/projects/99999",
-        headers={"Origin": "https://app.blugreen.com.br"}
-    )
-    
-    assert response.status_code == 404
-    assert "access-control-allow-origin" in response.headers
+def _idle_project(make_project, make_workflow) -> int:
+    return make_project().id
 
 
-def test_delete_200_with_origin_returns_cors_headers(client: TestClient, session: Session):
-    """DELETE 200 with Origin header returns CORS headers."""
-    # Create project
-    project = Project(name="Test", repository_url="https://github.com/test/test")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
+@pytest.mark.parametrize(
+    "setup_project, expected_status",
+    [
+        (_project_with_running_workflow, 409),
+        (_missing_project, 404),
+        (_idle_project, 200),
+    ],
+    ids=["409", "404", "200"],
+)
+def test_delete_with_origin_returns_cors_headers(
+    client: TestClient, make_project, make_workflow, setup_project, expected_status
+):
+    """DELETE with Origin header returns CORS headers whatever the outcome."""
+    project_id = setup_project(make_project, make_workflow)
 
-    # Delete with Origin header
     response = client.delete(
-        f"/projects/{project.id}",
+        f"/projects/{project_id}",
         headers={"Origin": "https://app.blugreen.com.br"}
     )
-    
-    assert response.status_code == 200
+
+    assert response.status_code == expected_status
     assert "access-control-allow-origin" in response.headers
 
 
@@ -324,20 +218,13 @@ def test_delete_200_with_origin_returns_cors_headers(client: TestClient, session
 # Test 6: Force delete works correctly
 # ============================================================
 
-def test_force_delete_with_dependencies_returns_200(client: TestClient, session: Session):
+def test_force_delete_with_dependencies_returns_200(client: TestClient, make_project, make_workflow):
     """DELETE with ?force=true cancels dependencies and deletes."""
-    # Create project with active workflow
-    project = Project(name="Active", repository_url="https://github.com/test/active")
-    session.add(project)
-    session.commit()
-    session.refresh(project)
-
-    workflow = Workflow(name="W", project_id=project.id, status=WorkflowStatus.RUNNING)
-    session.add(workflow)
-    session.commit()
+    project = make_project(name="Active")
+    make_workflow(project, status=WorkflowStatus.RUNNING)
 
     # Force delete
     response = client.delete(f"/projects/{project.id}?force=true")
-    
+
     assert response.status_code == 200
     assert response.json()["status"] == "deleted"
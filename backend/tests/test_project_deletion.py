@@ -0,0 +1,95 @@
+"""
+Tests for the project deletion service.
+
+Ensures that:
+1. Active dependencies are counted per kind and block deletion
+2. Finished dependencies do not block deletion
+3. Closing a project stops its active dependencies
+"""
+
+from sqlmodel import Session
+
+from app.models.product import ProductStatus
+from app.models.project import ProjectStatus
+from app.models.task import TaskStatus
+from app.models.workflow import Workflow, WorkflowStatus
+from app.services.project_deletion import check_active_dependencies, close_project
+
+# ============================================================
+# Test 1: Active dependencies block deletion
+# ============================================================
+
+def test_check_active_dependencies_counts_each_kind(
+    session: Session, make_project, make_workflow, make_product, make_task
+):
+    """Only in-flight workflows, products and tasks are counted."""
+    project = make_project(status=ProjectStatus.ACTIVE)
+    make_workflow(project, status=WorkflowStatus.PENDING)
+    make_workflow(project, status=WorkflowStatus.IN_PROGRESS)
+    make_workflow(project, status=WorkflowStatus.COMPLETED)
+    make_product(project, status=ProductStatus.RUNNING)
+    make_product(project, status=ProductStatus.DRAFT)
+    make_task(project, status=TaskStatus.PENDING)
+    make_task(project, status=TaskStatus.IN_PROGRESS)
+    make_task(project, status=TaskStatus.IN_PROGRESS)
+    make_task(project, status=TaskStatus.FAILED)
+
+    can_delete, response = check_active_dependencies(project.id, session)
+
+    assert can_delete is False
+    assert response["details"] == [
+        "O projeto está em execução",
+        "Há 2 workflow(s) em execução",
+        "Há 1 produto(s) em execução",
+        "Há 3 tarefa(s) em execução",
+    ]
+
+
+# ============================================================
+# Test 2: Finished dependencies do not block deletion
+# ============================================================
+
+def test_check_active_dependencies_allows_finished_project(
+    session: Session, make_project, make_workflow, make_product, make_task
+):
+    """A project whose processes have all finished can be deleted."""
+    project = make_project(status=ProjectStatus.DRAFT)
+    make_workflow(project, status=WorkflowStatus.COMPLETED)
+    make_product(project, status=ProductStatus.COMPLETED)
+    make_task(project, status=TaskStatus.COMPLETED)
+
+    assert check_active_dependencies(project.id, session) == (True, {})
+
+
+# ============================================================
+# Test 3: Closing a project stops its active dependencies
+# ============================================================
+
+async def test_close_project_reports_stopped_counts(
+    session: Session, make_project, make_workflow, make_product, make_task
+):
+    """close_project cancels in-flight processes, leaves finished ones alone and unblocks deletion."""
+    project = make_project(status=ProjectStatus.ACTIVE)
+    pending = make_workflow(project, status=WorkflowStatus.PENDING)
+    make_workflow(project, status=WorkflowStatus.IN_PROGRESS)
+    completed = make_workflow(project, status=WorkflowStatus.COMPLETED)
+    make_product(project, status=ProductStatus.RUNNING)
+    make_task(project, status=TaskStatus.IN_PROGRESS)
+    make_task(project, status=TaskStatus.COMPLETED)
+
+    result = await close_project(project.id, session)
+
+    assert result == {
+        "success": True,
+        "workflows_stopped": 2,
+        "products_stopped": 1,
+        "tasks_cancelled": 1,
+    }
+    assert session.get(Workflow, pending.id).status == WorkflowStatus.CANCELLED
+    assert session.get(Workflow, completed.id).status == WorkflowStatus.COMPLETED
+    assert check_active_dependencies(project.id, session) == (True, {})
+
+
+async def test_close_missing_project_reports_failure(session: Session):
+    """close_project on an unknown id reports failure instead of raising."""
+    assert await close_project(99999, session) == {"success": False, "error": "Project not found"}